@@ -1,30 +1,73 @@
-import time
-
+import hashlib
+import multiprocessing
+import re
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+import ahocorasick
+import numpy as np
+import orjson
 import pandas as pd
-import requests
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
 import generate_normalize_repo_to_analyze
-from github_config import HEADERS
+from github_config import GRAPHQL_URL, RATE_LIMITER, get_headers
 from logger_config import get_logger
 
 """
 Module for collecting and analyzing cross-language collaboration issues in GitHub repositories.
 
 Environment:
-    - Requires the 'GITHUB_TOKEN_GITCOLLABCOLLECTOR' environment variable to be set with a valid GitHub token.
+    - Requires the 'GITHUB_TOKEN_GITCOLLABCOLLECTOR' environment variable to be set with a valid GitHub token
+      (or 'GITHUB_TOKENS_GITCOLLABCOLLECTOR' with several comma-separated tokens, see github_config).
 
 Globals:
-    - MAX_PR_PAGES (int): Max number of pages to fetch for pull requests.
-    - MAX_PAGES_ISSUES (int): Max number of pages to fetch for issues.
+    - MAX_PR_PAGES (int): Max number of pages (of 100) to fetch for pull requests.
+    - MAX_PAGES_ISSUES (int): Max number of pages (of 100) to fetch for issues.
+    - MAX_WORKERS (int): Max number of repositories analyzed concurrently. Pages of one repository are fetched
+      sequentially (GraphQL cursors), so latency is hidden by fetching many repositories at once.
+    - SCAN_CACHE_SIZE (int): Max number of texts whose scan results are kept in memory.
+    - SCORE_BATCH_SIZE (int): Number of repositories whose texts a scoring worker scans in one analyze_texts call.
+    - REPO_CONTENT_QUERY (str): GraphQL query fetching one page of pull request and issue titles and bodies.
     - logger (logging.Logger): Logger configured at INFO level.
-    - KEYWORDS (list[str]): List of domain-specific keywords related to cross-language integration issues.
+    - _RAW_KEYWORDS (list[str]): List of domain-specific keywords related to cross-language integration issues.
+    - KEYWORDS (tuple[str]): _RAW_KEYWORDS lowercased, deduplicated and sorted.
+    - KEYWORD_AUTOMATON (ahocorasick.Automaton): Aho–Corasick automaton over KEYWORDS.
+    - KEYWORD_DATABASE (hyperscan.Database | None): Case-insensitive Hyperscan database over KEYWORDS,
+      used instead of KEYWORD_AUTOMATON when the optional 'hyperscan' package is installed.
 """
 MAX_PR_PAGES = 50
 MAX_PAGES_ISSUES = 10
+MAX_WORKERS = 16
+SCAN_CACHE_SIZE = 50_000
+SCORE_BATCH_SIZE = 16
+
+REPO_CONTENT_QUERY = """
+query($owner: String!, $name: String!, $prCursor: String, $issueCursor: String,
+      $withPrs: Boolean!, $withIssues: Boolean!) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: 100, after: $prCursor, orderBy: {field: CREATED_AT, direction: DESC}) @include(if: $withPrs) {
+      nodes { title body }
+      pageInfo { hasNextPage endCursor }
+    }
+    issues(first: 100, after: $issueCursor, orderBy: {field: CREATED_AT, direction: DESC}) @include(if: $withIssues) {
+      nodes { title body }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
 
 logger = get_logger(__name__)
 
-KEYWORDS = [
+_RAW_KEYWORDS = [
     # Interop and FFI
     "interop", "interoperability", "cross-language", "multi-language", "multilanguage",
     "foreign function", "foreign function interface", "FFI", "FFI binding", "FFI bindings",
@@ -32,13 +75,13 @@ KEYWORDS = [
     "ffi layer", "ffi wrapper", "foreign language interface", "foreign function call",
     "foreign code interface", "language binding", "language bindings", "language bridge",
     "interop layer", "native interface", "interop wrapper", "native binding", "native bindings",
-    "platform binding", "platform bindings", "interop layer", "interlanguage wrapper",
+    "platform binding", "platform bindings", "interlanguage wrapper",
     "interlanguage adapter", "binding generator", "interop toolkit",
 
     # Explicit technical integration
     "wrapper", "glue code", "interface adapter", "interface adapters", "custom wrapper",
     "manual wiring", "binding", "bridge", "stub", "interop code", "language integration layer",
-    "handwritten adapter", "adapter layer", "interlanguage adapter", "shim layer",
+    "handwritten adapter", "adapter layer", "shim layer",
     "compatibility wrapper", "binding layer", "integration scaffold", "integration module",
     "wrapper module", "bridge module", "intermediate wrapper", "proxy layer", "adapter pattern",
     "interop facade", "had to write a wrapper", "had to adapt manually", "manual integration logic",
@@ -57,10 +100,10 @@ KEYWORDS = [
 
     # Interoperability frameworks and tools
     "SWIG", "swig", "JNI", "jni", "JNA", "jna", "JPL", "jpl", "JSR223", "jsr223", "jsr",
-    "GraalVM", "graalvm", "Truffle", "truffle", "javacall", "Java Native Interface"
+    "GraalVM", "graalvm", "Truffle", "truffle", "javacall", "Java Native Interface",
     "pybind11", "CFFI", "cffi", "Ctypes", "ctype", "NIF", "nif", "NAPI", "napi",
     "swi-prolog-jpl", "jpl.jar", "SWI", "boost.python", "python-cffi", "python bindings",
-    "foreign function interface", "libffi", "dlopen", "dlsym", "ctypeslib", "node-addon-api",
+    "libffi", "dlopen", "dlsym", "ctypeslib", "node-addon-api",
     "nan", "NAN", "node-gyp", "node-ffi", "ffi-napi", "node-FFI", "FFI-napi", "ffi-NAPI", "FFI-NAPI",
     "Native Implemented Function", "native implemented function", "port driver", "Erlang port",
     "C node", "erlang port", "c node", "polyglot context", "GraalVM interop", "Graal interop",
@@ -78,178 +121,423 @@ KEYWORDS = [
     "failed integration", "integration fails", "integration failed", "manual override",
     "configuration hell", "multi-build-system", "multiple compilers", "fails to integrate",
     "can't integrate", "unable to integrate", "manual integration", "manual glue", "manual config",
-    "manual fix", "manual patch", "manual adjustment", "handwritten interop", "multi-build-system",
-    "multiple compilers", "toolchain mismatch",  "fragile integration", "brittle integration",
+    "manual fix", "manual patch", "manual adjustment", "handwritten interop",
+    "toolchain mismatch", "fragile integration", "brittle integration",
     "unstable integration", "hard to maintain interop", "interop not scalable",
 
     # Interface modules or syntaxes
     "foreign predicate", "interface module", "foreign module", "foreign interface",
     "interface declaration", "external interface", "interop declaration",
-    "language interface", "bridge module", "interop module",
+    "language interface", "interop module",
     "foreign block", "foreign import", "foreign export",
     "native declaration", "foreign definition", "external binding",
     "module binding", "foreign section",
 ]
 
+KEYWORDS = tuple(sorted({kw.lower() for kw in _RAW_KEYWORDS}))
 
-def fetch_paginated_artifacts(repo, artifact_type, per_page=100, max_pages=50, skip_condition=None, label="artifact"):
-    """
-    Fetches paginated artifacts (issues or pull requests) from a GitHub repository.
-
-    Parameters:
-        repo (str): Repository full name (e.g., "owner/repo").
-        artifact_type (str): "issues" or "pulls", used in the GitHub API endpoint.
-        per_page (int): Number of items per page (max 100). Default is 100.
-        max_pages (int): Maximum number of pages to fetch. Default is 50.
-        skip_condition (callable, optional): Function that returns True for items to skip.
-        label (str): Label for logging purposes (e.g., "issue" or "pull request").
-
-    Returns:
-        list[dict]: List of artifacts retrieved from the API, filtered if needed.
-    """
-    all_items = []
-    for page in range(1, max_pages + 1):
-        url = f"https://api.github.com/repos/{repo}/{artifact_type}"
-        params = {"state": "all", "per_page": per_page, "page": page}
-        response = requests.get(url, headers=HEADERS, params=params)
-
-        if response.status_code != 200:
-            logger.error(f"Error fetching {artifact_type} for {repo}, page {page}: {response.status_code}")
-            break
+KEYWORD_AUTOMATON = ahocorasick.Automaton()
+for _kw in KEYWORDS:
+    KEYWORD_AUTOMATON.add_word(_kw, _kw)
+KEYWORD_AUTOMATON.make_automaton()
 
-        items = response.json()
-        if not items:
-            logger.debug(f"No more {label}s found for {repo} at page {page}.")
-            break
+if hyperscan is not None:
+    KEYWORD_DATABASE = hyperscan.Database()
+    KEYWORD_DATABASE.compile(
+        expressions=[re.escape(kw).encode() for kw in KEYWORDS],
+        ids=list(range(len(KEYWORDS))),
+        flags=[hyperscan.HS_FLAG_CASELESS] * len(KEYWORDS)
+    )
+else:
+    KEYWORD_DATABASE = None
 
-        for item in items:
-            if skip_condition and skip_condition(item):
-                continue
-            all_items.append(item)
+_thread_local = threading.local()
+_scan_cache = OrderedDict()
+_scan_cache_lock = threading.Lock()
 
-        if len(items) < per_page:
-            logger.debug(f"Fetched last page ({page}) of {label}s for {repo}.")
-            break
 
-    logger.info(f"Fetched {len(all_items)} {label}s for {repo}")
-    return all_items
+def iter_repo_content_pages(repo, max_pr_pages=MAX_PR_PAGES, max_issue_pages=MAX_PAGES_ISSUES):
+    """
+        Yields the titles and bodies of the pull requests and issues of a GitHub repository, page by page.
 
+        Each GraphQL request fetches the next page (100 items, newest first) of both pull requests and
+        issues, so only the fields used by the analysis are transferred. A connection is no longer requested
+        once its last page or its page limit is reached. Pages are only fetched as they are consumed.
 
-def fetch_pull_requests(repo, per_page=100, max_pages=50):
-    """
-        Fetches all pull requests from a GitHub repository using pagination.
+        Cursor pagination is sequential: a repository costs one round trip per page of its longest connection
+        (up to MAX_PR_PAGES), and GraphQL POST responses are neither cached nor revalidated with ETags by SESSION.
+        analyze_all makes up for the per-repository latency by fetching MAX_WORKERS repositories concurrently.
 
         Parameters:
             repo (str): Repository full name (e.g., "owner/repo").
-            per_page (int): Number of pull requests per page. Default is 100.
-            max_pages (int): Maximum number of pages to fetch. Default is 50.
+            max_pr_pages (int): Maximum number of pull request pages to fetch. Default is MAX_PR_PAGES.
+            max_issue_pages (int): Maximum number of issue pages to fetch. Default is MAX_PAGES_ISSUES.
 
-        Returns:
-            list[dict]: List of pull requests retrieved from the API.
+        Yields:
+            tuple[list[dict], list[dict]]: (pull_requests, issues) of one page, each item having 'title'
+                and 'body' keys (one of the lists is empty once its connection is exhausted).
     """
-    return fetch_paginated_artifacts(repo, "pulls", per_page, max_pages, label="pull request")
+    owner, name = repo.split("/", 1)
+    pr_cursor = issue_cursor = None
+    pr_pages = issue_pages = 0
+    with_prs, with_issues = max_pr_pages > 0, max_issue_pages > 0
+
+    while with_prs or with_issues:
+        variables = {
+            "owner": owner, "name": name,
+            "prCursor": pr_cursor, "issueCursor": issue_cursor,
+            "withPrs": with_prs, "withIssues": with_issues
+        }
+        response = RATE_LIMITER.post(
+            GRAPHQL_URL, resource="graphql", headers=get_headers("graphql"),
+            json={"query": REPO_CONTENT_QUERY, "variables": variables}
+        )
+        if response.status_code != 200:
+            logger.error(f"Error fetching pull requests and issues for {repo}: {response.status_code}")
+            return
+
+        payload = orjson.loads(response.content)
+        repository = (payload.get("data") or {}).get("repository")
+        if payload.get("errors") or repository is None:
+            logger.error(f"Error fetching pull requests and issues for {repo}: {payload.get('errors')}")
+            return
 
+        page_prs, page_issues = [], []
 
-def fetch_issues(repo, per_page=100, max_pages=10):
+        if with_prs:
+            connection = repository["pullRequests"]
+            page_prs = connection["nodes"]
+            pr_pages += 1
+            pr_cursor = connection["pageInfo"]["endCursor"]
+            with_prs = connection["pageInfo"]["hasNextPage"] and pr_pages < max_pr_pages
+
+        if with_issues:
+            connection = repository["issues"]
+            page_issues = connection["nodes"]
+            issue_pages += 1
+            issue_cursor = connection["pageInfo"]["endCursor"]
+            with_issues = connection["pageInfo"]["hasNextPage"] and issue_pages < max_issue_pages
+
+        yield page_prs, page_issues
+
+
+def fetch_repo_content(repo, max_pr_pages=MAX_PR_PAGES, max_issue_pages=MAX_PAGES_ISSUES):
     """
-        Fetches all issues (excluding pull requests) from a GitHub repository using pagination.
+        Fetches the titles and bodies of all the pull requests and issues of a GitHub repository with GraphQL.
 
         Parameters:
             repo (str): Repository full name (e.g., "owner/repo").
-            per_page (int): Number of issues per page. Default is 100.
-            max_pages (int): Maximum number of pages to fetch. Default is 10.
+            max_pr_pages (int): Maximum number of pull request pages to fetch. Default is MAX_PR_PAGES.
+            max_issue_pages (int): Maximum number of issue pages to fetch. Default is MAX_PAGES_ISSUES.
 
         Returns:
-            list[dict]: List of issues retrieved from the API, excluding pull requests.
-        """
-    return fetch_paginated_artifacts(repo, "issues", per_page, max_pages, skip_condition=lambda i: "pull_request" in i,
-                                     label="issue")
+            tuple[list[dict], list[dict]]: (pull_requests, issues), each item having 'title' and 'body' keys.
+    """
+    prs, issues = [], []
+    for page_prs, page_issues in iter_repo_content_pages(repo, max_pr_pages, max_issue_pages):
+        prs.extend(page_prs)
+        issues.extend(page_issues)
+
+    logger.info(f"Fetched {len(prs)} pull requests and {len(issues)} issues for {repo}")
+    return prs, issues
 
 
 def fetch_readme(repo):
     """
-        Fetches and decodes the README file from a GitHub repository.
+        Fetches the raw README file from a GitHub repository.
 
         Parameters:
             repo (str): Repository full name (e.g., "owner/repo").
 
         Returns:
-            str: The decoded README content as a UTF-8 string, or an empty string on error.
+            str: The README content as a UTF-8 string, or an empty string on error.
     """
     url = f"https://api.github.com/repos/{repo}/readme"
-    response = requests.get(url, headers=HEADERS)
+    response = RATE_LIMITER.get(url, headers={**get_headers(), "Accept": "application/vnd.github.raw"})
     if response.status_code != 200:
         logger.error(f"Error fetching README for {repo}: {response.status_code}")
         return ""
-    content = response.json().get("content", "")
-    encoding = response.json().get("encoding", "base64")
-    if encoding == "base64":
-        import base64
-        try:
-            return base64.b64decode(content).decode("utf-8", errors="ignore")
-        except Exception as e:
-            logger.exception(f"Failed to decode README for {repo}: {e}")
-            return ""
-    return ""
-
-
-def analyze_text(text):
+    return response.content.decode("utf-8", errors="ignore")
+
+
+def _scan_with_hyperscan(texts):
+    """
+        Scans the given texts in a single pass with KEYWORD_DATABASE.
+
+        The texts are UTF-8 encoded and joined with a NUL separator (which no keyword contains); each
+        match is mapped back to its text from its end offset. A Hyperscan scratch space is kept per thread.
+
+        Parameters:
+            texts (list[str]): The texts to analyze, in any case.
+
+        Returns:
+            list[dict[str, None]]: For each text, the keywords found in it, in order of first match.
+    """
+    if not hasattr(_thread_local, "scratch"):
+        _thread_local.scratch = hyperscan.Scratch(KEYWORD_DATABASE)
+
+    encoded = [text.encode("utf-8", errors="ignore") for text in texts]
+    starts = []
+    position = 0
+    for data in encoded:
+        starts.append(position)
+        position += len(data) + 1
+
+    found = [{} for _ in texts]
+
+    def on_match(kw_id, _start, end, _flags, _context):
+        found[bisect_right(starts, end - 1) - 1][KEYWORDS[kw_id]] = None
+
+    KEYWORD_DATABASE.scan(b"\0".join(encoded), match_event_handler=on_match, scratch=_thread_local.scratch)
+    return found
+
+
+def _scan_with_automaton(texts):
+    """
+        Scans the given texts in a single pass with KEYWORD_AUTOMATON.
+
+        The texts are joined with a NUL separator (which no keyword contains); each match is mapped
+        back to its text from its end offset.
+
+        Parameters:
+            texts (list[str]): The texts to analyze, already lowercased.
+
+        Returns:
+            list[dict[str, None]]: For each text, the keywords found in it, in order of first match.
+    """
+    starts = []
+    position = 0
+    for text in texts:
+        starts.append(position)
+        position += len(text) + 1
+
+    found = [{} for _ in texts]
+    for end, kw in KEYWORD_AUTOMATON.iter("\0".join(texts)):
+        found[bisect_right(starts, end) - 1][kw] = None
+    return found
+
+
+def _fingerprint(text):
+    """
+        Returns a compact fingerprint of a text, used as scan cache key.
+
+        Parameters:
+            text (str): The text to fingerprint.
+
+        Returns:
+            bytes: 16-byte BLAKE2b digest of the UTF-8 encoded text.
+    """
+    return hashlib.blake2b(text.encode("utf-8", errors="surrogatepass"), digest_size=16).digest()
+
+
+def analyze_text(text, already_lower=False):
     """
         Returns the list of keywords found in the given text.
 
         Parameters:
             text (str): The text to analyze.
+            already_lower (bool): Set to True when the text is already lowercased, to skip the copy.
 
         Returns:
-            str: keywords found in the text.
+            list[str]: keywords found in the text, each reported once.
     """
-    return [kw for kw in KEYWORDS if kw in text.lower()]
+    return analyze_texts([text], already_lower)[0]
 
 
-def analyze_repo(repo):
+def analyze_texts(texts, already_lower=False):
+    """
+        Returns the keywords found in each of the given texts, scanning them all in a single pass.
+
+        Uses KEYWORD_DATABASE (Hyperscan) when available, KEYWORD_AUTOMATON (Aho–Corasick) otherwise.
+        Results are cached by text fingerprint (up to SCAN_CACHE_SIZE texts), so identical bodies are only
+        scanned once per process, including identical bodies within the same call.
+
+        Parameters:
+            texts (list[str]): The texts to analyze.
+            already_lower (bool): Set to True when the texts are already lowercased, to skip the copies.
+
+        Returns:
+            list[list[str]]: For each text, the keywords found in it (each reported once).
+    """
+    keys = [_fingerprint(text) for text in texts]
+    results = [None] * len(texts)
+    with _scan_cache_lock:
+        for i, key in enumerate(keys):
+            cached = _scan_cache.get(key)
+            if cached is not None:
+                _scan_cache.move_to_end(key)
+                results[i] = cached
+
+    missing = list({keys[i]: i for i, result in enumerate(results) if result is None}.values())
+    if missing:
+        to_scan = [texts[i] for i in missing]
+        if KEYWORD_DATABASE is not None:
+            found = _scan_with_hyperscan(to_scan)
+        else:
+            if not already_lower:
+                to_scan = [text.lower() for text in to_scan]
+            found = _scan_with_automaton(to_scan)
+
+        with _scan_cache_lock:
+            for i, keywords in zip(missing, found):
+                results[i] = tuple(keywords)
+                _scan_cache[keys[i]] = results[i]
+            while len(_scan_cache) > SCAN_CACHE_SIZE:
+                _scan_cache.popitem(last=False)
+
+        scanned = {keys[i]: results[i] for i in missing}
+        for i, result in enumerate(results):
+            if result is None:
+                results[i] = scanned[keys[i]]
+
+    return [list(keywords) for keywords in results]
+
+
+def _artifact_texts(prs, issues):
+    """
+        Returns the lowercased 'title body' text of each pull request and issue.
+
+        Parameters:
+            prs (list[dict]): Pull requests, with 'title' and 'body' keys.
+            issues (list[dict]): Issues, with 'title' and 'body' keys.
+
+        Returns:
+            list[str]: One text per pull request, then one per issue.
+    """
+    return [f"{item.get('title') or ''} {item.get('body') or ''}".lower() for item in chain(prs, issues)]
+
+
+def collect_texts(repo):
+    """
+        Fetches the pull requests, issues and README of a GitHub repository and returns their texts.
+
+        Parameters:
+            repo (str): Repository full name (e.g., "owner/repo").
+
+        Returns:
+            tuple[int, int, list[str]]: (pr_count, issue_count, texts) where texts holds the lowercased
+                'title body' of each pull request and issue, followed by the README. Issues come from the
+                GraphQL 'issues' connection, which never includes pull requests.
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        content_future = executor.submit(fetch_repo_content, repo)
+        readme_future = executor.submit(fetch_readme, repo)
+        (prs, issues), readme = content_future.result(), readme_future.result()
+
+    texts = _artifact_texts(prs, issues)
+    texts.append(readme.lower())
+    return len(prs), len(issues), texts
+
+
+def score_repo(texts):
+    """
+        Scores the texts of one repository.
+
+        Parameters:
+            texts (list[str]): Lowercased texts of the repository, as returned by collect_texts.
+
+        Returns:
+            tuple[int, set[str]]: (score, found_set) where score is the total number of keyword occurrences
+                found (each keyword counted once per text) and found_set is the set of distinct keywords found.
+    """
+    found_set = set()
+    score = 0
+    for hits in analyze_texts(texts, already_lower=True):
+        score += len(hits)
+        found_set.update(hits)
+    return score, found_set
+
+
+def score_repos(texts_by_repo):
+    """
+        Scores the texts of several repositories with a single analyze_texts call over all of them.
+
+        Parameters:
+            texts_by_repo (list[list[str]]): Lowercased texts of each repository, as returned by collect_texts.
+
+        Returns:
+            list[tuple[int, set[str]]]: (score, found_set) for each repository, in order (see score_repo).
+    """
+    hits = analyze_texts(list(chain.from_iterable(texts_by_repo)), already_lower=True)
+    results = []
+    start = 0
+    for texts in texts_by_repo:
+        found_set = set()
+        score = 0
+        for text_hits in hits[start:start + len(texts)]:
+            score += len(text_hits)
+            found_set.update(text_hits)
+        results.append((score, found_set))
+        start += len(texts)
+    return results
+
+
+def analyze_repo(repo, early_exit=False):
     """
         Analyzes a GitHub repository for occurrences of predefined keywords in pull requests, issues, and README.
 
+        With early_exit, only whether the repository has a difficulty is of interest: the README is scanned
+        first, then pull requests and issues page by page, and fetching stops at the first page with a keyword.
+        The returned score and counts then only cover what was fetched up to that point.
+
         Parameters:
             repo (str): Repository full name (e.g., "owner/repo").
+            early_exit (bool): Stop fetching and scanning as soon as a keyword is found. Default is False.
 
         Returns:
-            tuple[int, int, int, int]: (score, total_artifacts, pr_count, issue_count) where:
+            tuple[int, int, int, int, set[str]]: (score, total_artifacts, pr_count, issue_count, found_set) where:
                 - score is the total number of keyword occurrences found,
                 - total_artifacts is the number of analyzed elements (PRs + issues + README).
                 - pr_count is the count of pull requests
                 - issue_count is the count of issues
+                - found_set is the set of distinct keywords found
     """
-    prs = fetch_pull_requests(repo)
-    issues = fetch_issues(repo)
-    readme = fetch_readme(repo)
-
-    pr_count = len(prs)
-    issue_count = len(issues)
+    if not early_exit:
+        pr_count, issue_count, texts = collect_texts(repo)
+        score, found_set = score_repo(texts)
+    else:
+        pr_count = issue_count = 0
+        score, found_set = score_repo([fetch_readme(repo).lower()])
+        if not score:
+            for page_prs, page_issues in iter_repo_content_pages(repo):
+                pr_count += len(page_prs)
+                issue_count += len(page_issues)
+                score, found_set = score_repo(_artifact_texts(page_prs, page_issues))
+                if score:
+                    break
 
-    matched_keywords = []
+    total_artifacts = pr_count + issue_count + 1
+    return score, total_artifacts, pr_count, issue_count, found_set
 
-    for pr in prs:
-        text = (pr.get("title") or "") + " " + (pr.get("body") or "")
-        matched_keywords.extend(analyze_text(text))
 
-    for issue in issues:
-        if "pull_request" in issue:
-            continue
-        text = (issue.get("title") or "") + " " + (issue.get("body") or "")
-        matched_keywords.extend(analyze_text(text))
+def _collect_texts_safe(repo, lang1, lang2):
+    """
+        Runs collect_texts for one repository, logging instead of raising on failure.
 
-    matched_keywords.extend(analyze_text(readme))
+        Parameters:
+            repo (str): Repository full name (e.g., "owner/repo").
+            lang1 (str): First language of the pair, for logging.
+            lang2 (str): Second language of the pair, for logging.
 
-    total_artifacts = pr_count + issue_count + 1
-    score = len(matched_keywords)
-    return score, total_artifacts, pr_count, issue_count, matched_keywords
+        Returns:
+            tuple | None: The result of collect_texts, or None if fetching failed.
+    """
+    logger.info(f"|-> Analysis of {repo} ({lang1}-{lang2})...")
+    try:
+        return collect_texts(repo)
+    except Exception as e:
+        logger.exception(f"Error analysing repository {repo} : {e}")
+        return None
 
 
 def analyze_all(csv_path, detailed_output, summary_output, max_repos):
     """
         Analyzes a set of GitHub repositories listed in a CSV file and generates detailed and summary reports.
 
+        Texts are first fetched for every repository on a thread pool (I/O-bound); those of the retained
+        repositories are then scored on a process pool (CPU-bound), each task scanning the texts of
+        SCORE_BATCH_SIZE repositories in one batch with score_repos.
+
         Parameters:
             csv_path (str): Path to the CSV file containing repositories with columns 'FullName', 'Lang1', 'Lang2'.
             detailed_output (str): Path to the output CSV file for per-repository analysis.
@@ -263,37 +551,44 @@ def analyze_all(csv_path, detailed_output, summary_output, max_repos):
     all_results = []
     skipped_repos = 0
 
-    for _, row in df.iterrows():
-        repo = row['FullName']
-        lang1 = row['Lang1']
-        lang2 = row['Lang2']
-        logger.info(f"|-> Analysis of {repo} ({lang1}-{lang2})...")
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        collected = list(executor.map(_collect_texts_safe, df['FullName'], df['Lang1'], df['Lang2']))
 
-        try:
-            score, total_items, pr_count, issue_count, keywords_found = analyze_repo(repo)
-        except Exception as e:
-            logger.exception(f"Error analysing repository {repo} : {e}")
+    retained = []
+    rows = df[['Lang1', 'Lang2', 'FullName']].itertuples(index=False, name=None)
+    for (lang1, lang2, full_name), collection in zip(rows, collected):
+        if collection is None:
             continue
 
+        pr_count, issue_count, texts = collection
         if pr_count < 5 or issue_count < 5:
-            logger.debug(f"Skipping {repo} (PRs: {pr_count}, Issues: {issue_count})")
+            logger.debug(f"Skipping {full_name} (PRs: {pr_count}, Issues: {issue_count})")
             skipped_repos += 1
             continue
-
-        has_difficulty = score > 0
-        difficulty_density = round(score / total_items, 4) if total_items else 0.0
-
-        all_results.append({
-            "Lang1": lang1,
-            "Lang2": lang2,
-            "FullName": repo,
-            "artifacts_analyzed": total_items,
-            "difficulty_keywords_found": score,
-            "difficulty_density": difficulty_density,
-            "repo_has_difficulty": has_difficulty,
-            "keywords_detected": "; ".join(set(keywords_found))
-        })
-        time.sleep(0.5)
+        retained.append((lang1, lang2, full_name, pr_count, issue_count, texts))
+
+    with multiprocessing.Pool() as pool:
+        texts_by_repo = [texts for *_, texts in retained]
+        batches = [
+            texts_by_repo[i:i + SCORE_BATCH_SIZE] for i in range(0, len(texts_by_repo), SCORE_BATCH_SIZE)
+        ]
+        scores = chain.from_iterable(pool.imap(score_repos, batches))
+
+        for (lang1, lang2, full_name, pr_count, issue_count, _), (score, found_set) in zip(retained, scores):
+            total_items = pr_count + issue_count + 1
+            has_difficulty = score > 0
+            difficulty_density = round(score / total_items, 4) if total_items else 0.0
+
+            all_results.append({
+                "Lang1": lang1,
+                "Lang2": lang2,
+                "FullName": full_name,
+                "artifacts_analyzed": total_items,
+                "difficulty_keywords_found": score,
+                "difficulty_density": difficulty_density,
+                "repo_has_difficulty": has_difficulty,
+                "keywords_detected": "; ".join(found_set)
+            })
 
     logger.info(f"Skipped {skipped_repos} repositories with insufficient PRs or issues.")
 
@@ -314,19 +609,18 @@ def analyze_all(csv_path, detailed_output, summary_output, max_repos):
     )
     summary['difficulty_rate'] = summary['repos_with_difficulty'] / summary['total_repos']
 
-    summary['true_total_available'] = summary.apply(
-        lambda row_rc: generate_normalize_repo_to_analyze.get_total_repo_count(row_rc['Lang1'], row_rc['Lang2']),
-        axis=1
-    )
+    summary['true_total_available'] = pd.array([
+        generate_normalize_repo_to_analyze.get_total_repo_count(lang1, lang2)
+        for lang1, lang2 in summary[['Lang1', 'Lang2']].itertuples(index=False, name=None)
+    ], dtype="Int64")
 
-    summary['rarity_score'] = summary.apply(
-        lambda row_rs: round(
-            1 - (row_rs['total_repos'] / min(row_rs['true_total_available'], (max_repos * 2))), 4
-        ) if row_rs['true_total_available'] and row_rs['true_total_available'] > 0 else None,
-        axis=1
+    totals = summary['true_total_available'].astype(float)
+    summary['rarity_score'] = np.where(
+        totals > 0,
+        (1 - summary['total_repos'] / np.minimum(totals, max_repos * 2)).round(4),
+        np.nan
     )
 
-    time.sleep(1)
     summary.to_csv(summary_output, sep=';', index=False)
     logger.info(f"\nEnriched summary recorded in {summary_output}")
     logger.debug(f"\n{summary.to_string(index=False)}")
@@ -1,29 +1,56 @@
+import csv
+import math
+import shelve
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-import pandas as pd
+import orjson
 import requests
 
-from github_config import HEADERS, SEARCH_URL
+from github_config import GRAPHQL_URL, RATE_LIMITER, SEARCH_URL
 from logger_config import get_logger
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 """
 Module for identifying GitHub repositories that use two specified programming languages.
 
 Environment:
-    - Requires the 'GITHUB_TOKEN_GITCOLLABCOLLECTOR' environment variable to be set with a valid GitHub token.
+    - Requires the 'GITHUB_TOKEN_GITCOLLABCOLLECTOR' environment variable to be set with a valid GitHub token
+      (or 'GITHUB_TOKENS_GITCOLLABCOLLECTOR' with several comma-separated tokens, see github_config).
 
 Globals:
     - LANG_URL_TEMPLATE (str): GitHub API endpoint to retrieve languages used in a repository.
     - MAX_REPOS (int): Maximum number of repositories fetched per language (default: 150).
     - MIN_STARS (int): Minimum number of stars a repository must have to be considered (default: 3).
     - THRESHOLD (float): Maximum collaboration score to retain a language pair (default: 0.4).
+    - MAX_WORKERS (int): Maximum number of language checks (batches of repositories) run concurrently (default: 8).
+    - SEARCH_PER_PAGE (int): Number of results requested per search page, the GitHub maximum (default: 100).
+    - LANGUAGES_BATCH_SIZE (int): Maximum number of repositories whose languages are fetched per GraphQL query
+      (default: 100).
+    - SEARCH_CACHE_PATH (str): Path of the shelve file persisting search results across runs (default: "search_cache").
+    - SEARCH_CACHE_TTL (int): Number of seconds a cached search result stays valid (default: 3600).
     - logger (logging.Logger): Logger configured at INFO level.
     - github_langs (dict[str, str]): Dictionary mapping normalized language names to GitHub language identifiers.
+    - VALID_LANGS (frozenset[str]): Language names that have a GitHub identifier (keys of github_langs).
+    - _languages_cache (dict[str, frozenset[str]]): Languages of each repository already fetched during the run.
 """
 LANG_URL_TEMPLATE = "https://api.github.com/repos/{full_name}/languages"
 MAX_REPOS = 150
 MIN_STARS = 3
 THRESHOLD = 0.4
+MAX_WORKERS = 8
+SEARCH_PER_PAGE = 100
+LANGUAGES_BATCH_SIZE = 100
+SEARCH_CACHE_PATH = "search_cache"
+SEARCH_CACHE_TTL = 3600
+
+_search_cache_lock = threading.Lock()
+_languages_cache = {}
 
 logger = get_logger(__name__)
 
@@ -42,11 +69,42 @@ github_langs = {
     "E": "E",
 }
 
+VALID_LANGS = frozenset(github_langs)
+
+
+@lru_cache(maxsize=None)
+def _count_repos(lang1, lang2, stars):
+    """
+        Returns the total number of GitHub repositories matching two languages and a minimum star count,
+        querying each (lang1, lang2, stars) combination at most once per run.
+
+        Failed requests raise instead of returning, so that they are not memoized.
+
+        Parameters:
+            lang1 (str): First programming language.
+            lang2 (str): Second programming language.
+            stars (int): Minimum number of stars.
+
+        Returns:
+            int: The total count of matching repositories.
+
+        Raises:
+            requests.HTTPError: If the GitHub API does not answer with 200.
+    """
+    query = f"language:{lang1} language:{lang2} stars:>={stars}"
+    params = {"q": query, "per_page": 1}
+    response = RATE_LIMITER.get(SEARCH_URL, resource="search", params=params)
+    if response.status_code != 200:
+        raise requests.HTTPError(response.status_code, response=response)
+    return orjson.loads(response.content).get("total_count", 0)
+
 
 def get_total_repo_count(lang1, lang2, stars=MIN_STARS):
     """
         Returns the total number of GitHub repositories matching two languages and a minimum star count.
 
+        Successful counts are memoized (see _count_repos); failed ones are queried again on the next call.
+
         Parameters:
             lang1 (str): First programming language.
             lang2 (str): Second programming language.
@@ -55,17 +113,17 @@ def get_total_repo_count(lang1, lang2, stars=MIN_STARS):
         Returns:
             int | None: The total count of matching repositories, or None on error.
     """
-    query = f"language:{lang1} language:{lang2} stars:>={stars}"
-    params = {"q": query}
-    response = requests.get(SEARCH_URL, headers=HEADERS, params=params)
-    if response.status_code == 200:
-        return response.json().get("total_count", 0)
-    else:
-        logger.error(f"Error while counting repos for {lang1}-{lang2}: {response.status_code}")
+    try:
+        return _count_repos(lang1, lang2, stars)
+    except requests.HTTPError as e:
+        logger.error(f"Error while counting repos for {lang1}-{lang2}: {e.response.status_code}")
+        return None
+    except requests.RequestException as e:
+        logger.exception(f"Exception while counting repos for {lang1}-{lang2}: {e}")
         return None
 
 
-def normalize_and_filter_pairs(csv_path: str, threshold: float = THRESHOLD) -> pd.DataFrame:
+def normalize_and_filter_pairs(csv_path: str, threshold: float = THRESHOLD) -> "pd.DataFrame":
     """
         Normalizes language pairs from a CSV file and filters them by collaboration score threshold.
 
@@ -76,13 +134,82 @@ def normalize_and_filter_pairs(csv_path: str, threshold: float = THRESHOLD) -> p
         Returns:
             pd.DataFrame: DataFrame with columns 'Lang1_norm' and 'Lang2_norm' for valid pairs.
     """
+    import pandas as pd
+
     df = pd.read_csv(csv_path, sep=';')
-    df['Lang1_norm'] = df['Language1'].map(github_langs)
-    df['Lang2_norm'] = df['Language2'].map(github_langs)
-    df = df.dropna(subset=['Lang1_norm', 'Lang2_norm'])
-    df = df[df['CollaborationScore'] <= threshold]
-    logger.info(f"{len(df)} pairs retained with a score ≤ {threshold}")
-    return df[['Lang1_norm', 'Lang2_norm']]
+    mask = (
+        df['Language1'].isin(VALID_LANGS)
+        & df['Language2'].isin(VALID_LANGS)
+        & (df['CollaborationScore'] <= threshold)
+    )
+    selected = df.loc[mask, ['Language1', 'Language2']]
+    filtered_df = pd.DataFrame({
+        'Lang1_norm': selected['Language1'].map(github_langs).to_numpy(),
+        'Lang2_norm': selected['Language2'].map(github_langs).to_numpy()
+    })
+    logger.info(f"{len(filtered_df)} pairs retained with a score ≤ {threshold}")
+    return filtered_df
+
+
+def _search_repo_names(query: str, max_repos: int, label: str):
+    """
+        Runs a GitHub repository search sorted by recent updates and collects up to max_repos distinct full names.
+
+        The ceil(max_repos / 100) result pages are requested concurrently; they are then consumed in order,
+        stopping at the first failed or short page, or at the last page announced by the 'Link' header.
+        Complete results are persisted in SEARCH_CACHE_PATH, keyed by query and max_repos, and reused for
+        SEARCH_CACHE_TTL seconds, also by later runs; failed searches are not cached.
+
+        Parameters:
+            query (str): Search query (e.g., "language:C stars:>=3").
+            max_repos (int): Maximum number of repositories to return.
+            label (str): Name of the searched language(s), used in log messages.
+
+        Returns:
+            list[str]: List of distinct repository full names (e.g., "owner/repo"), in search order.
+    """
+    cache_key = f"{query} max:{max_repos}"
+    with _search_cache_lock, shelve.open(SEARCH_CACHE_PATH) as cache:
+        cached = cache.get(cache_key)
+    if cached is not None and time.time() - cached[0] < SEARCH_CACHE_TTL:
+        logger.debug(f"Using cached search results for {label}")
+        return cached[1]
+
+    pages = range(1, math.ceil(max_repos / SEARCH_PER_PAGE) + 1)
+
+    def fetch_page(page):
+        params = {
+            "q": query,
+            "sort": "updated",
+            "order": "desc",
+            "per_page": SEARCH_PER_PAGE,
+            "page": page
+        }
+        return RATE_LIMITER.get(SEARCH_URL, resource="search", params=params)
+
+    names = {}
+    complete = False
+    try:
+        with ThreadPoolExecutor(max_workers=max(len(pages), 1)) as executor:
+            for response in executor.map(fetch_page, pages):
+                if response.status_code != 200:
+                    logger.error(f"Error fetching repositories for {label}: {response.status_code} - {response.text}")
+                    break
+                items = orjson.loads(response.content).get("items", [])
+                names.update(dict.fromkeys(repo["full_name"] for repo in items))
+                if len(items) < SEARCH_PER_PAGE or "next" not in response.links:
+                    complete = True
+                    break
+            else:
+                complete = True
+    except Exception as e:
+        logger.exception(f"Exception while fetching repositories for {label}: {e}")
+
+    full_names = list(names)[:max_repos]
+    if complete:
+        with _search_cache_lock, shelve.open(SEARCH_CACHE_PATH) as cache:
+            cache[cache_key] = (time.time(), full_names)
+    return full_names
 
 
 def fetch_repos_for_lang(lang: str, stars: int = MIN_STARS, max_repos: int = MAX_REPOS):
@@ -97,22 +224,34 @@ def fetch_repos_for_lang(lang: str, stars: int = MIN_STARS, max_repos: int = MAX
         Returns:
             list[str]: List of repository full names (e.g., "owner/repo").
     """
-    query = f"language:{lang} stars:>={stars}"
-    params = {
-        "q": query,
-        "sort": "updated",
-        "order": "desc",
-        "per_page": min(max_repos, 100)
-    }
-    try:
-        response = requests.get(SEARCH_URL, headers=HEADERS, params=params)
+    return _search_repo_names(f"language:{lang} stars:>={stars}", max_repos, lang)
+
+
+def _get_languages(full_name: str) -> frozenset:
+    """
+        Returns the languages used in a GitHub repository, fetching them at most once per run.
+
+        Results are kept in _languages_cache, which check_repos_batch also reads and fills. Failed requests
+        raise instead of returning, so that they are not memoized.
+
+        Parameters:
+            full_name (str): Repository full name (e.g., "owner/repo").
+
+        Returns:
+            frozenset[str]: Names of the languages used in the repository.
+
+        Raises:
+            requests.HTTPError: If the GitHub API does not answer with 200.
+    """
+    languages = _languages_cache.get(full_name)
+    if languages is None:
+        url = LANG_URL_TEMPLATE.format(full_name=full_name)
+        response = RATE_LIMITER.get(url)
         if response.status_code != 200:
-            logger.error(f"Error fetching repositories for {lang}: {response.status_code} - {response.text}")
-            return []
-        return [repo["full_name"] for repo in response.json().get("items", [])]
-    except Exception as e:
-        logger.exception(f"Exception while fetching repositories for {lang}: {e}")
-        return []
+            raise requests.HTTPError(response.status_code, response=response)
+        languages = frozenset(orjson.loads(response.content))
+        _languages_cache[full_name] = languages
+    return languages
 
 
 def repo_uses_both_languages(full_name: str, lang1: str, lang2: str) -> bool:
@@ -127,59 +266,161 @@ def repo_uses_both_languages(full_name: str, lang1: str, lang2: str) -> bool:
         Returns:
             bool: True if both languages are used in the repo, False otherwise or on error.
     """
-    url = LANG_URL_TEMPLATE.format(full_name=full_name)
     try:
-        response = requests.get(url, headers=HEADERS)
-        if response.status_code != 200:
-            logger.error(f"Error fetching languages for {full_name}: {response.status_code}")
-            return False
-        languages = response.json().keys()
+        languages = _get_languages(full_name)
         return lang1 in languages and lang2 in languages
+    except requests.HTTPError as e:
+        logger.error(f"Error fetching languages for {full_name}: {e.response.status_code}")
+        return False
     except Exception as e:
         logger.exception(f"Exception while checking languages for {full_name}: {e}")
         return False
 
 
-def collect_all_repos(filtered_df: pd.DataFrame, output_csv: str = "repos_to_analyze.csv"):
+@lru_cache(maxsize=None)
+def _languages_batch_query(size: int) -> str:
+    """
+        Builds a GraphQL query fetching the languages of `size` repositories, one aliased field (r0, r1, ...) each.
+
+        The owner and name of repository i are passed as the variables o<i> and n<i>.
+
+        Parameters:
+            size (int): Number of repositories in the batch.
+
+        Returns:
+            str: The GraphQL query.
+    """
+    variables = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(size))
+    fields = " ".join(
+        f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ languages(first: 100) {{ nodes {{ name }} }} }}"
+        for i in range(size)
+    )
+    return f"query({variables}) {{ {fields} }}"
+
+
+def _fetch_languages_batch(batch: list) -> list:
+    """
+        Fetches the languages of a batch of repositories with a single GraphQL query and stores them in
+        _languages_cache.
+
+        Repositories that cannot be resolved (e.g., deleted or renamed) are logged and left out of the cache.
+
+        Parameters:
+            batch (list[str]): Repository full names (e.g., "owner/repo"), at most LANGUAGES_BATCH_SIZE.
+
+        Returns:
+            list[str]: The repositories to check one by one instead, i.e. the whole batch if the query failed.
+    """
+    variables = {}
+    for i, full_name in enumerate(batch):
+        owner, _, name = full_name.partition("/")
+        variables[f"o{i}"] = owner
+        variables[f"n{i}"] = name
+
+    data = None
+    try:
+        response = RATE_LIMITER.post(
+            GRAPHQL_URL, resource="graphql",
+            json={"query": _languages_batch_query(len(batch)), "variables": variables}
+        )
+        if response.status_code == 200:
+            data = orjson.loads(response.content).get("data")
+        else:
+            logger.error(f"Error fetching languages of {len(batch)} repositories: {response.status_code}")
+    except Exception as e:
+        logger.exception(f"Exception while fetching languages of {len(batch)} repositories: {e}")
+
+    if data is None:
+        logger.warning(f"Checking the languages of {len(batch)} repositories one by one")
+        return batch
+
+    for i, full_name in enumerate(batch):
+        repository = data.get(f"r{i}")
+        if repository is None:
+            logger.error(f"Error fetching languages for {full_name}: repository not found")
+            continue
+        _languages_cache[full_name] = frozenset(node["name"] for node in repository["languages"]["nodes"])
+    return []
+
+
+def check_repos_batch(candidates: list, lang1: str, lang2: str) -> list:
+    """
+        Returns the candidate repositories that use both specified programming languages.
+
+        Languages already in _languages_cache (e.g., candidates of a previous pair) are not fetched again. The others
+        are fetched through GraphQL for up to LANGUAGES_BATCH_SIZE repositories per request, instead of one REST
+        request per repository; the batches are fetched concurrently, by up to MAX_WORKERS threads. Repositories of
+        a failed batch are checked one by one with repo_uses_both_languages.
+
+        Parameters:
+            candidates (list[str]): Repository full names (e.g., "owner/repo").
+            lang1 (str): First language to check.
+            lang2 (str): Second language to check.
+
+        Returns:
+            list[str]: Full names of the candidates using both languages, in candidate order.
+    """
+    uncached = [full_name for full_name in dict.fromkeys(candidates) if full_name not in _languages_cache]
+    batches = [uncached[i:i + LANGUAGES_BATCH_SIZE] for i in range(0, len(uncached), LANGUAGES_BATCH_SIZE)]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        fallback = {full_name for names in executor.map(_fetch_languages_batch, batches) for full_name in names}
+
+    valid = []
+    for full_name in candidates:
+        if full_name in fallback:
+            uses_both = repo_uses_both_languages(full_name, lang1, lang2)
+        else:
+            languages = _languages_cache.get(full_name, frozenset())
+            uses_both = lang1 in languages and lang2 in languages
+        if uses_both:
+            valid.append(full_name)
+    return valid
+
+
+def collect_all_repos(filtered_df: "pd.DataFrame", output_csv: str = "repos_to_analyze.csv"):
     """
         Collects GitHub repositories using both languages from each normalized pair in the DataFrame.
 
+        Candidates are the union of the most recently updated repositories of each language (fetch_repos_for_lang).
+        Pairs for which neither language matches any repository (see get_total_repo_count) are skipped. The
+        languages of the candidates are checked in batches with check_repos_batch.
+
         Parameters:
             filtered_df (pd.DataFrame): DataFrame with columns 'Lang1_norm' and 'Lang2_norm'.
             output_csv (str): Path to the output CSV file. Default is "repos_to_analyze.csv".
 
         Returns:
-            None: Writes a CSV file with valid repositories.
+            None: Writes a CSV file with valid repositories, row by row as they are validated.
     """
-    all_repos = []
+    saved_repos = 0
 
-    for _, row in filtered_df.iterrows():
-        lang1, lang2 = row['Lang1_norm'], row['Lang2_norm']
-        logger.info(f"|-> Searching repositories for language pair: {lang1} – {lang2}")
+    with open(output_csv, "w", newline="") as output_file:
+        writer = csv.DictWriter(output_file, fieldnames=["FullName", "Lang1", "Lang2"], lineterminator="\n")
+        writer.writeheader()
 
-        repos1 = fetch_repos_for_lang(lang1)
-        time.sleep(1)
-        repos2 = fetch_repos_for_lang(lang2)
-        time.sleep(1)
+        for lang1, lang2 in filtered_df[['Lang1_norm', 'Lang2_norm']].itertuples(index=False, name=None):
+            logger.info(f"|-> Searching repositories for language pair: {lang1} – {lang2}")
 
-        candidate_repos = list(set(repos1 + repos2))
+            total_count = get_total_repo_count(lang1, lang2)
+            if total_count == 0:
+                logger.info(f"No repositories match {lang1} – {lang2}, skipping pair")
+                continue
+            repos1 = fetch_repos_for_lang(lang1)
+            repos2 = fetch_repos_for_lang(lang2)
+            candidate_repos = list(dict.fromkeys(repos1 + repos2))
 
-        for full_name in candidate_repos:
-            if repo_uses_both_languages(full_name, lang1, lang2):
+            for full_name in check_repos_batch(candidate_repos, lang1, lang2):
                 logger.info(f"{full_name} uses both {lang1} and {lang2}")
-                all_repos.append({
+                writer.writerow({
                     "FullName": full_name,
                     "Lang1": lang1,
                     "Lang2": lang2
                 })
-            else:
-                logger.debug(f"{full_name} does not use both {lang1} and {lang2}")
+                saved_repos += 1
 
-            time.sleep(0.5)
+            output_file.flush()
 
-    if all_repos:
-        df_out = pd.DataFrame(all_repos)
-        df_out.to_csv(output_csv, index=False)
-        logger.info(f"{len(df_out)} valid repositories saved to {output_csv}")
+    if saved_repos:
+        logger.info(f"{saved_repos} valid repositories saved to {output_csv}")
     else:
         logger.warning("No repositories retained after language check.")
@@ -1,18 +1,214 @@
+import itertools
 import os
+import threading
+import time
+
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from logger_config import get_logger
 
 """
 Module for GitHub API authentication and base configuration.
 
 Environment:
-    - Requires the 'GITHUB_TOKEN_GITCOLLABCOLLECTOR' environment variable to be set with a valid GitHub token.
+    - Requires the 'GITHUB_TOKEN_GITCOLLABCOLLECTOR' environment variable to be set with a valid GitHub token,
+      or 'GITHUB_TOKENS_GITCOLLABCOLLECTOR' with several comma-separated tokens to rotate between.
 
 Globals:
-    - GITHUB_TOKEN (str): GitHub personal access token retrieved from environment variable.
-    - HEADERS (dict): Authorization headers to be used in GitHub API requests.
+    - _tokens_env (str | None): Raw value of the token environment variable, GITHUB_TOKENS_GITCOLLABCOLLECTOR first.
+    - GITHUB_TOKENS (list[str]): GitHub personal access tokens retrieved from environment variables.
+    - GITHUB_TOKEN (str): First GitHub token.
+    - HEADERS (dict): Authorization headers for the first token (see get_headers() to rotate tokens).
     - SEARCH_URL (str): GitHub Search API endpoint for repositories.
+    - GRAPHQL_URL (str): GitHub GraphQL API endpoint.
+    - CACHE_NAME (str): Path (without extension) of the SQLite HTTP cache used by SESSION.
+    - SESSION (requests_cache.CachedSession): Shared HTTP session reusing connections, retrying transient errors
+      (including on the read-only GraphQL POST requests)
+      and revalidating cached responses with conditional requests (ETag / If-None-Match).
+    - RATE_LIMIT_THRESHOLD (int): Remaining requests below which RATE_LIMITER starts pacing a resource.
+    - RATE_LIMITER (GitHubRateLimiter): Shared rate limiter wrapping SESSION.
 """
-GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN_GITCOLLABCOLLECTOR")
-if not GITHUB_TOKEN:
-    raise ValueError("The GitHub token is not defined in the GITHUB_TOKEN_GITCOLLABCOLLECTOR environment variable.")
+_tokens_env = os.environ.get("GITHUB_TOKENS_GITCOLLABCOLLECTOR") or os.environ.get("GITHUB_TOKEN_GITCOLLABCOLLECTOR")
+GITHUB_TOKENS = [token.strip() for token in (_tokens_env or "").split(",") if token.strip()]
+if not GITHUB_TOKENS:
+    raise ValueError(
+        "The GitHub token is not defined in the GITHUB_TOKEN_GITCOLLABCOLLECTOR "
+        "(or GITHUB_TOKENS_GITCOLLABCOLLECTOR) environment variable."
+    )
+GITHUB_TOKEN = GITHUB_TOKENS[0]
 HEADERS = {"Authorization": f"token {GITHUB_TOKEN}"}
 SEARCH_URL = "https://api.github.com/search/repositories"
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+CACHE_NAME = "gh_cache"
+
+SESSION = requests_cache.CachedSession(cache_name=CACHE_NAME, backend="sqlite", cache_control=True)
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=None,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+))
+
+RATE_LIMIT_THRESHOLD = 10
+
+logger = get_logger(__name__)
+
+_token_counter = itertools.count()
+_cooling_until = {}
+_token_lock = threading.Lock()
+
+
+def get_headers(resource="core"):
+    """
+        Returns authorization headers for the next GitHub token, rotating between GITHUB_TOKENS.
+
+        Tokens whose budget for the given resource is spent (see mark_rate_limited) are skipped until their
+        reset time; if all of them are cooling down, the one available the soonest is returned.
+
+        Parameters:
+            resource (str): Rate-limit resource of the upcoming request ('core', 'search', 'graphql', ...).
+
+        Returns:
+            dict: Authorization headers to be used in a GitHub API request.
+    """
+    now = time.time()
+    with _token_lock:
+        start = next(_token_counter)
+        candidates = [GITHUB_TOKENS[(start + i) % len(GITHUB_TOKENS)] for i in range(len(GITHUB_TOKENS))]
+        available = [token for token in candidates if _cooling_until.get((token, resource), 0) <= now]
+        token = available[0] if available else min(candidates, key=lambda t: _cooling_until[(t, resource)])
+    return {"Authorization": f"token {token}"}
+
+
+def mark_rate_limited(headers, resource, until):
+    """
+        Marks the token used in the given headers as rate-limited for a resource until a given time.
+
+        Parameters:
+            headers (dict): Headers of the rate-limited request.
+            resource (str): Rate-limit resource whose budget is spent.
+            until (float): Epoch time at which the token can be used again.
+    """
+    token = headers.get("Authorization", "").removeprefix("token ")
+    with _token_lock:
+        _cooling_until[(token, resource)] = max(_cooling_until.get((token, resource), 0), until)
+
+
+class GitHubRateLimiter:
+    """
+        Paces requests to the GitHub API from the rate-limit headers of its responses.
+
+        Budgets are tracked per token and per rate-limit resource ('core', 'search', 'graphql', ...) from the
+        'X-RateLimit-Remaining' / 'X-RateLimit-Reset' headers. Requests are only delayed once fewer than
+        `threshold` calls remain, spreading the remaining calls until the reset time, or when GitHub asked
+        to back off with 'Retry-After' (secondary rate limits). A token close to its limit is marked as cooling
+        down so that get_headers() rotates to another one. A rate-limited request is retried once, with the
+        next token when several are configured.
+
+        Parameters:
+            session (requests.Session): Session used to send the requests.
+            threshold (int): Remaining requests below which requests are paced. Default is RATE_LIMIT_THRESHOLD.
+    """
+
+    def __init__(self, session, threshold=RATE_LIMIT_THRESHOLD):
+        self.session = session
+        self.threshold = threshold
+        self._budgets = {}
+        self._blocked_until = {}
+        self._lock = threading.Lock()
+
+    def wait(self, resource, authorization=""):
+        """
+            Sleeps if the budget of the given token and resource is nearly spent or if GitHub asked to back off.
+
+            Parameters:
+                resource (str): Rate-limit resource of the upcoming request.
+                authorization (str): 'Authorization' header of the upcoming request.
+        """
+        key = (authorization, resource)
+        now = time.time()
+        with self._lock:
+            remaining, reset = self._budgets.get(key, (None, 0))
+            blocked_until = self._blocked_until.get(key, 0)
+
+        delay = blocked_until - now
+        if remaining is not None and remaining < self.threshold:
+            delay = max(delay, (reset - now) / max(remaining, 1))
+        if delay > 0:
+            logger.info(f"Rate limit ({resource}): {remaining} requests left, sleeping {delay:.1f}s")
+            time.sleep(delay)
+
+    def update(self, response, resource, headers):
+        """
+            Records the rate-limit state reported by a response.
+
+            Parameters:
+                response (requests.Response): Response from the GitHub API.
+                resource (str): Rate-limit resource assumed when the response does not name one.
+                headers (dict): Headers sent with the request.
+        """
+        if getattr(response, "from_cache", False):
+            return
+        response_headers = response.headers
+        resource = response_headers.get("X-RateLimit-Resource", resource)
+        key = (headers.get("Authorization", ""), resource)
+        with self._lock:
+            if "X-RateLimit-Remaining" in response_headers and "X-RateLimit-Reset" in response_headers:
+                remaining = int(response_headers["X-RateLimit-Remaining"])
+                reset = int(response_headers["X-RateLimit-Reset"])
+                self._budgets[key] = (remaining, reset)
+                if remaining < self.threshold and len(GITHUB_TOKENS) > 1:
+                    mark_rate_limited(headers, resource, reset)
+            if "Retry-After" in response_headers:
+                self._blocked_until[key] = time.time() + int(response_headers["Retry-After"])
+                mark_rate_limited(headers, resource, self._blocked_until[key])
+
+    def request(self, method, url, resource="core", **kwargs):
+        """
+            Sends a request through the session, waiting first if needed and retrying once if rate-limited.
+
+            Parameters:
+                method (str): HTTP method (e.g., "GET").
+                url (str): Request URL.
+                resource (str): Rate-limit resource of the request. Default is "core".
+                **kwargs: Passed to requests.Session.request (headers, params, json, ...).
+
+            Returns:
+                requests.Response: The API response.
+        """
+        headers = kwargs.pop("headers", None) or get_headers(resource)
+        for attempt in range(2):
+            self.wait(resource, headers.get("Authorization", ""))
+            response = self.session.request(method, url, headers=headers, **kwargs)
+            self.update(response, resource, headers)
+            rate_limited = response.status_code in (403, 429) and (
+                "Retry-After" in response.headers or response.headers.get("X-RateLimit-Remaining") == "0"
+            )
+            if not rate_limited:
+                break
+            headers = {**headers, **get_headers(resource)}
+        return response
+
+    def get(self, url, resource="core", **kwargs):
+        """
+            Sends a GET request. See request().
+        """
+        return self.request("GET", url, resource, **kwargs)
+
+    def post(self, url, resource="core", **kwargs):
+        """
+            Sends a POST request. See request().
+        """
+        return self.request("POST", url, resource, **kwargs)
+
+
+RATE_LIMITER = GitHubRateLimiter(SESSION)
@@ -4,25 +4,42 @@ import logging
 Module for configuring and providing a reusable logger instance.
 
 Globals:
-    - None
+    - LOG_FORMAT (str): Format of the log records (e.g., "[INFO] module: message").
+    - _configured (bool): Whether the root logger has already been configured.
 """
 
+LOG_FORMAT = "[%(levelname)s] %(name)s: %(message)s"
+_configured = False
+
+
+def _configure_once():
+    """
+        Configures the root logger with a stream handler, the standard formatter and level INFO.
+
+        Only the first call has an effect, so the handler is attached once per process; it runs at import time.
+    """
+    global _configured
+    if _configured:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    _configured = True
+
+
+_configure_once()
+
 
 def get_logger(name=__name__):
     """
-        Returns a logger instance configured with a stream handler and standard formatter.
+        Returns a logger instance whose records go to the stream handler configured at import time.
 
         Parameters:
             name (str): Name of the logger, typically passed as __name__ from the calling module.
 
         Returns:
-            logging.Logger: A logger with level INFO and a single StreamHandler, initialized once.
+            logging.Logger: A logger inheriting level INFO and the StreamHandler from the root logger.
     """
-    logger = logging.getLogger(name)
-    if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter("[%(levelname)s] %(name)s: %(message)s")
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        logger.setLevel(logging.INFO)
-    return logger
+    return logging.getLogger(name)